@@ -1,8 +1,7 @@
 import logging
-from pathlib import Path
 import textwrap
 
-from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
+from pygeoapi.process.base import BaseProcessor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -49,6 +48,24 @@ PROCESS_METADATA = {
 }
 
 
+# dedented once at import; filled in per job by create_slurm_script
+SLURM_SCRIPT_TEMPLATE = textwrap.dedent("""\
+    #!/bin/sh
+    #SBATCH --exclusive
+
+    mkdir {workspace_dir}/datastack
+    curl "{datastack_url}" | tar -xzvf - -C {workspace_dir}/datastack
+
+    eval "$(~/bin/micromamba shell hook -s posix)"
+    micromamba activate invest_env
+    MODEL_ID=$(python -c "from natcap.invest import datastack; print(datastack.extract_parameter_set('{json_path}').model_id)")
+    invest --debug --taskgraph-log-level=DEBUG run \
+        --datastack {json_path} \
+        --workspace {workspace_dir}/${{MODEL_ID}}_workspace \
+        $MODEL_ID
+    """)
+
+
 class ExecuteProcessor(BaseProcessor):
     """InVEST execute process"""
 
@@ -76,23 +93,10 @@ class ExecuteProcessor(BaseProcessor):
             string contents of the script
         """
         json_path = f'{workspace_dir}/datastack/parameters.invest.json'
-        return textwrap.dedent(f"""\
-            #!/bin/sh
-            #SBATCH --exclusive
-
-            curl -o datastack.tgz "{datastack_url}"
-            mkdir {workspace_dir}/datastack
-            tar -xzvf datastack.tgz -C {workspace_dir}/datastack
-            rm datastack.tgz
-
-            eval "$(~/bin/micromamba shell hook -s posix)"
-            micromamba activate invest_env
-            MODEL_ID=$(python -c "from natcap.invest import datastack; print(datastack.extract_parameter_set('{json_path}').model_id)")
-            invest --debug --taskgraph-log-level=DEBUG run \
-                --datastack {json_path} \
-                --workspace {workspace_dir}/${{MODEL_ID}}_workspace \
-                $MODEL_ID
-            """)
+        return SLURM_SCRIPT_TEMPLATE.format(
+            datastack_url=datastack_url,
+            workspace_dir=workspace_dir,
+            json_path=json_path)
 
     def get_outputs(self, workspace_dir):
         """Return outputs given a workspace from completed slurm job.
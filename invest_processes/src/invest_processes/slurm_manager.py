@@ -1,16 +1,23 @@
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
 from http import HTTPStatus
+import gzip
 import json
 import logging
+import mimetypes
 import os
 from pathlib import Path
+import shutil
 import subprocess
+import tarfile
 import tempfile
 import threading
 import time
 from typing import Any, Optional, Tuple
 
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
+import requests.adapters
 import pygeoapi.api.processes
 from pygeoapi.process.base import JobNotFoundError
 from pygeoapi.process.manager.base import BaseManager
@@ -25,11 +32,65 @@ from pygeoapi.util import (
 
 LOGGER = logging.getLogger(__name__)
 BUCKET_NAME = 'results.compute.naturalcapitalalliance.org'
-STORAGE_CLIENT = storage.Client()
-BUCKET = STORAGE_CLIENT.bucket(BUCKET_NAME)
-
-WORKSPACE_ROOT = 'workspaces'
-os.makedirs(WORKSPACE_ROOT, exist_ok=True)
+_BUCKET = None
+_BUCKET_LOCK = threading.Lock()
+
+# default parent directory of the slurm job workspaces. can be overridden
+# with the manager's `workspace_root` option. resolved once, so that the
+# workspace paths handed to sbatch (--chdir) and embedded in the slurm
+# scripts are always absolute.
+WORKSPACE_ROOT = Path(
+    os.environ.get('INVEST_WORKSPACE_ROOT', 'workspaces')).resolve()
+
+# number of threads used to upload a workspace to the bucket
+UPLOAD_WORKERS = int(os.environ.get('INVEST_UPLOAD_WORKERS', 16))
+
+# if set, and the gcloud CLI is installed, upload workspaces with
+# `gcloud storage cp` rather than the python client. gcloud must be
+# authenticated with an account that can write to the bucket.
+UPLOAD_WITH_GCLOUD = bool(os.environ.get('INVEST_UPLOAD_WITH_GCLOUD'))
+GCLOUD_BIN = shutil.which('gcloud')
+
+# if set, text files (logs, tables, etc.) are gzipped before upload and
+# stored with Content-Encoding: gzip. GCS decompresses them transparently
+# for clients that don't accept gzip, so downloads are unchanged.
+GZIP_TEXT_UPLOADS = bool(os.environ.get('INVEST_GZIP_TEXT_UPLOADS'))
+GZIP_SUFFIXES = {'.csv', '.html', '.json', '.log', '.slurm', '.txt'}
+
+# workspaces larger than this are always uploaded file by file, even if they
+# have enough files to be bundled, so that big rasters upload independently
+BUNDLE_MAX_BYTES = 2 * 1024 ** 3
+
+# files larger than this are uploaded in chunks of CHUNK_BYTES in parallel,
+# rather than as a single stream
+LARGE_FILE_BYTES = 32 * 1024 ** 2
+CHUNK_BYTES = 16 * 1024 ** 2
+
+# resolve the slurm CLI paths once, rather than searching PATH on every call
+SACCT_BIN = shutil.which('sacct') or 'sacct'
+SACCTMGR_BIN = shutil.which('sacctmgr') or 'sacctmgr'
+SBATCH_BIN = shutil.which('sbatch') or 'sbatch'
+SQUEUE_BIN = shutil.which('squeue') or 'squeue'
+
+# bounds, in seconds, of the exponential backoff used when polling slurm
+# for the status of a running job
+POLL_INTERVAL_MIN = float(os.environ.get('INVEST_POLL_MIN', 2))
+POLL_INTERVAL_MAX = float(os.environ.get('INVEST_POLL_MAX', 30))
+
+# max age, in seconds, of a cached get_job result that may be used to answer
+# a status request, instead of querying slurm again
+STATUS_CACHE_TTL = float(os.environ.get('INVEST_STATUS_CACHE_TTL', 5))
+
+# max number of finished and post-processed jobs whose get_job results are
+# kept, since they can no longer change
+COMPLETED_JOB_CACHE_SIZE = 1000
+
+# if set, poll with `squeue --only-job-state`, which slurmctld can answer
+# without taking the job read lock. requires slurm 24.05 or later.
+SQUEUE_ONLY_JOB_STATE = bool(os.environ.get('INVEST_SQUEUE_ONLY_JOB_STATE'))
+
+# OGC job statuses that mean the slurm job will not run any further
+FINISHED_STATUSES = {JobStatus.successful, JobStatus.failed, JobStatus.dismissed}
 
 
 def convert_job_status(status):
@@ -45,6 +106,8 @@ def convert_job_status(status):
         'BOOT_FAIL': JobStatus.failed,      # terminated due to node boot failure
         'CANCELLED': JobStatus.dismissed,   # cancelled by user or administrator
         'COMPLETED': JobStatus.successful,  # completed execution successfully; finished with an exit code of zero on all nodes
+        'COMPLETING': JobStatus.running,    # finished or cancelled and performing cleanup tasks, such as an epilog script
+        'CONFIGURING': JobStatus.running,   # allocated nodes and waiting for them to boot or otherwise become ready for use
         'DEADLINE': JobStatus.failed,       # terminated due to reaching the latest start time that allows the job to reach its deadline given its TimeLimit
         'FAILED': JobStatus.failed,         # completed execution unsuccessfully; non-zero exit code or other failure condition
         'NODE_FAIL': JobStatus.failed,      # terminated due to node failure
@@ -141,24 +204,442 @@ def get_job_result(api, request, job_id):
 
 pygeoapi.api.processes.get_job_result = get_job_result
 
-def upload_directory_to_bucket(dir_path):
+def get_bucket():
+    """Get the results bucket, creating the storage client on first use.
+
+    The client is shared by every upload, and its connection pool is sized
+    to match UPLOAD_WORKERS.
+
+    Returns:
+        google.cloud.storage.Bucket
+    """
+    global _BUCKET
+    with _BUCKET_LOCK:
+        if _BUCKET is None:
+            client = storage.Client()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=UPLOAD_WORKERS, pool_maxsize=UPLOAD_WORKERS)
+            client._http.mount('https://', adapter)
+            _BUCKET = client.bucket(BUCKET_NAME)
+    return _BUCKET
+
+
+def iter_files(dir_path):
+    """Recursively yield the paths to all files in a directory.
+
+    Args:
+        dir_path (str): path to the directory to walk
+
+    Yields:
+        string path to each file. Each path starts with dir_path and a
+        separator, so relative paths can be sliced off without relpath.
+    """
+    dir_stack = [str(dir_path)]
+    while dir_stack:
+        with os.scandir(dir_stack.pop()) as entries:
+            file_paths = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dir_stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    file_paths.append(entry.path)
+        yield from file_paths
+
+
+def upload_directory_bundle(dir_path, paths):
+    """Upload files from a directory to the GCP bucket as one tar.gz archive.
+
+    The archive is named after the directory and placed under its prefix,
+    at gs://<bucket>/<dir name>/<dir name>.tar.gz, so that copying
+    everything under the prefix still retrieves the whole workspace. Users
+    have to extract the archive to browse the files.
+
+    The archive is streamed straight into a resumable upload rather than
+    written to a local file first. It is compressed at the fastest level,
+    since InVEST output rasters are usually compressed already.
+
+    Args:
+        dir_path (str): path to the directory to be uploaded
+        paths (list[str]): paths to the files in the directory to include,
+            as yielded by iter_files
+
+    Returns:
+        None
+    """
+    dir_path = Path(dir_path)
+    blob_name = f'{dir_path.name}/{dir_path.name}.tar.gz'
+    prefix_len = len(os.path.join(dir_path, ''))
+    blob = get_bucket().blob(blob_name)
+    with blob.open('wb', chunk_size=8 * 1024 * 1024,
+                   content_type='application/gzip') as blob_file, \
+            gzip.GzipFile(fileobj=blob_file, mode='wb', compresslevel=1) as gz, \
+            tarfile.open(fileobj=gz, mode='w|') as tar:
+        for path in paths:
+            tar.add(path, arcname=path[prefix_len:])
+    LOGGER.debug('Uploaded %d files to gs://%s/%s', len(paths), BUCKET_NAME, blob_name)
+
+
+def upload_gzipped_file(bucket, path, blob_name):
+    """Gzip a file and upload it, stored with Content-Encoding: gzip.
+
+    The compressed data is spooled to a temporary file, which only goes to
+    disk if it is larger than CHUNK_BYTES.
+
+    Args:
+        bucket (google.cloud.storage.Bucket): bucket to upload to
+        path (str): path to the file to upload
+        blob_name (str): name of the blob to upload it to
+
+    Returns:
+        None
+    """
+    blob = bucket.blob(blob_name)
+    blob.content_encoding = 'gzip'
+    content_type = mimetypes.guess_type(blob_name)[0] or 'text/plain'
+    with open(path, 'rb') as file, \
+            tempfile.SpooledTemporaryFile(max_size=CHUNK_BYTES) as gz_file:
+        with gzip.GzipFile(fileobj=gz_file, mode='wb', compresslevel=6) as gz:
+            shutil.copyfileobj(file, gz)
+        # with the size known, small files take a single multipart request
+        # rather than a resumable upload
+        size = gz_file.tell()
+        gz_file.seek(0)
+        blob.upload_from_file(gz_file, size=size, content_type=content_type)
+
+
+def upload_directory_to_bucket(dir_path, bundle_threshold=None):
     """Upload everything in a given directory to the GCP bucket.
 
+    If INVEST_UPLOAD_WITH_GCLOUD is set and gcloud is installed, the
+    directory is copied with `gcloud storage cp`, and bundle_threshold is
+    ignored. Otherwise, files are uploaded concurrently, because uploading
+    the many small files in a typical workspace is bound by per-request
+    latency, not bandwidth. Files larger than LARGE_FILE_BYTES (e.g. big
+    output rasters) are then each uploaded as concurrent chunks, so they are
+    not limited to the throughput of a single stream. If
+    INVEST_GZIP_TEXT_UPLOADS is set, text files are compressed first. A
+    failed file does not stop the others from being uploaded.
+
     Args:
         dir_path (str): path to the directory to be uploaded
-        bucket_name (str): GCP bucket name
+        bundle_threshold (int): if the directory has more files than this,
+            and is no larger than BUNDLE_MAX_BYTES, upload it as a single
+            tar.gz archive instead (see upload_directory_bundle). If None,
+            files are always uploaded individually.
 
     Returns:
         None
+
+    Raises:
+        RuntimeError if any file failed to upload
     """
     dir_path = Path(dir_path)
-    for path in dir_path.rglob('*'):
-        if not path.is_file():
-            continue
-        rel_path = str(path.relative_to(dir_path.parent))
-        print('uploading', rel_path)
-        BUCKET.blob(rel_path).upload_from_filename(path)
-        LOGGER.debug(f'Uploaded {path} to gs://{BUCKET_NAME}/{rel_path}')
+    if UPLOAD_WITH_GCLOUD and GCLOUD_BIN:
+        # copying to the bucket root places the files under the
+        # directory name, like the python client uploads below
+        try:
+            subprocess.run(
+                [GCLOUD_BIN, 'storage', 'cp', '--recursive', str(dir_path),
+                 f'gs://{BUCKET_NAME}/'],
+                capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f'Failed to upload {dir_path} with gcloud: {e.stderr}') from e
+        return
+
+    paths = list(iter_files(dir_path))
+    sizes = [os.path.getsize(path) for path in paths]
+    if (bundle_threshold is not None and len(paths) > bundle_threshold and
+            sum(sizes) <= BUNDLE_MAX_BYTES):
+        upload_directory_bundle(dir_path, paths)
+        return
+
+    # the paths all start with dir_path, so slice off everything before its
+    # name rather than calling relpath on every one. unlike joining with
+    # dir_path.parent, this also works if dir_path is relative.
+    prefix_len = len(str(dir_path)) - len(dir_path.name)
+    filenames, text_filenames, large_filenames = [], [], []
+    for path, size in zip(paths, sizes):
+        filename = path[prefix_len:]
+        if size > LARGE_FILE_BYTES:
+            large_filenames.append(filename)
+        elif GZIP_TEXT_UPLOADS and os.path.splitext(filename)[1] in GZIP_SUFFIXES:
+            text_filenames.append(filename)
+        else:
+            filenames.append(filename)
+
+    bucket = get_bucket()
+    results = transfer_manager.upload_many_from_filenames(
+        bucket, filenames, source_directory=dir_path.parent,
+        worker_type=transfer_manager.THREAD, max_workers=UPLOAD_WORKERS)
+    if text_filenames:
+        # compress in the upload threads, so that files are compressed in
+        # parallel and only the ones being uploaded are held at once
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = [
+                executor.submit(
+                    upload_gzipped_file, bucket,
+                    os.path.join(dir_path.parent, filename), filename)
+                for filename in text_filenames]
+        results += [future.exception() for future in futures]
+        filenames += text_filenames
+    for filename in large_filenames:
+        try:
+            transfer_manager.upload_chunks_concurrently(
+                os.path.join(dir_path.parent, filename), bucket.blob(filename),
+                chunk_size=CHUNK_BYTES, worker_type=transfer_manager.THREAD,
+                max_workers=UPLOAD_WORKERS)
+            results.append(None)
+        except Exception as err:
+            results.append(err)
+    filenames += large_filenames
+
+    failed_count = 0
+    for filename, result in zip(filenames, results):
+        if isinstance(result, Exception):
+            LOGGER.error('Failed to upload %s: %s', filename, result)
+            failed_count += 1
+        else:
+            LOGGER.debug('Uploaded %s to gs://%s/%s', filename, BUCKET_NAME, filename)
+    if failed_count:
+        raise RuntimeError(
+            f'{failed_count} of {len(filenames)} files in {dir_path} '
+            'failed to upload')
+
+
+def format_sacct_time(time_string):
+    """Format a timestamp from sacct for pygeoapi.
+
+    Args:
+        time_string (str): a time as output by sacct, e.g. for Submit or End
+
+    Returns:
+        the time with a Z (UTC) appended, because pygeoapi requires the
+        timezone and slurm uses the system timezone, which should be UTC.
+        An empty string if the time is 'Unknown', e.g. the start time of a
+        job that has not started yet.
+    """
+    if time_string == 'Unknown':
+        return ''
+    return f'{time_string}Z'
+
+
+def parse_job_comment(comment_string):
+    """Parse the job metadata stored in a slurm job comment.
+
+    Args:
+        comment_string (str): the job comment, as returned by sacct or squeue
+
+    Returns:
+        dict of job metadata, or an empty dict if the comment is not valid JSON
+    """
+    # if comment was modified with sacctmgr, it will have replaced " with `
+    # so convert the quotes back before parsing as json
+    comment_string = comment_string.replace('`', '"')
+    try:
+        LOGGER.debug(comment_string)
+        return json.loads(comment_string)
+    except json.decoder.JSONDecodeError:
+        return {}
+
+
+def run_slurm_command(command, input_text=None):
+    """Run a slurm CLI command and return its stdout.
+
+    Args:
+        command (list): the command to run and its arguments
+        input_text (str): text to pass to the command on stdin, if any
+
+    Returns:
+        string stdout of the command
+
+    Raises:
+        subprocess.CalledProcessError if the command exits with an error.
+        stderr is captured on the exception.
+    """
+    LOGGER.debug('Calling %s', command)
+    # python's own descriptors are non-inheritable anyway, so there's no
+    # need to close them all in the child
+    stdout = subprocess.run(
+        command, input=input_text, capture_output=True, text=True,
+        check=True, close_fds=False).stdout
+    LOGGER.debug('stdout from %s: %s', Path(command[0]).name, stdout)
+    return stdout
+
+
+def log_future_exception(future):
+    """Log the exception raised by a Future's callable, if there was one.
+
+    Exceptions raised in a pool thread are otherwise only stored on the
+    Future, so use this as a done callback when nothing waits on it.
+
+    Args:
+        future (concurrent.futures.Future): a finished Future
+
+    Returns:
+        None
+    """
+    if not future.cancelled() and future.exception() is not None:
+        LOGGER.error(
+            'Error in background task', exc_info=future.exception())
+
+
+class SlurmStatusPoller:
+    """Wait on many slurm jobs at once with a single polling thread.
+
+    Each poll queries all outstanding jobs at once, and completion is
+    delivered through the Future returned by register. The poll interval
+    backs off exponentially between interval_min and interval_max, and
+    resets when a job is registered or changes state.
+    """
+
+    def __init__(self):
+        # bounds of the poll interval backoff, in seconds
+        self.interval_min = POLL_INTERVAL_MIN
+        self.interval_max = POLL_INTERVAL_MAX
+        self._lock = threading.Lock()
+        self._jobs = {}  # maps job id to the Future returned by register
+        self._states = {}  # maps job id to the last state seen by the poller
+        self._job_registered = threading.Event()
+        self._thread = None
+
+    def register(self, job_id):
+        """Start tracking a slurm job.
+
+        Args:
+            job_id: id of the slurm job
+
+        Returns:
+            concurrent.futures.Future that resolves to a tuple of the final
+            (JobStatus, int exit code) once the job has finished
+        """
+        job = Future()
+        with self._lock:
+            self._jobs[job_id] = job
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._poll_loop, name='slurm-status-poller',
+                    daemon=True)
+                self._thread.start()
+        self._job_registered.set()
+        return job
+
+    def _poll_loop(self):
+        """Poll slurm for the outstanding jobs until the process exits."""
+        poll_interval = self.interval_min
+        while True:
+            # sleep until the next poll is due, or a new job is registered
+            if self._job_registered.wait(poll_interval):
+                self._job_registered.clear()
+                poll_interval = self.interval_min
+            else:
+                poll_interval = min(poll_interval * 2, self.interval_max)
+
+            with self._lock:
+                job_ids = list(self._jobs)
+            if not job_ids:
+                continue
+            try:
+                if self._poll(job_ids):
+                    poll_interval = self.interval_min
+            except Exception as err:
+                LOGGER.exception(err)
+
+    def _poll(self, job_ids):
+        """Query the state of the given jobs and resolve any that finished.
+
+        slurmctld is asked first, because it answers from memory and knows
+        about every job that is still in the queue. Only the jobs that it
+        reports as finished, or no longer reports at all, are looked up in
+        slurmdbd with sacct, which is also where their final state and exit
+        code come from.
+
+        Args:
+            job_ids: list of ids of the slurm jobs to query
+
+        Returns:
+            True if any of the jobs changed state since the last poll
+        """
+        controller_states = self._get_controller_states(job_ids)
+        changed = False
+        finished_job_ids = []
+        for job_id in job_ids:
+            state = controller_states.get(job_id)
+            if self._states.get(job_id) != state:
+                self._states[job_id] = state
+                changed = True
+            if state is None:
+                finished_job_ids.append(job_id)
+                continue
+            try:
+                if convert_job_status(state) in FINISHED_STATUSES:
+                    finished_job_ids.append(job_id)
+            except KeyError:
+                # a state we don't know, but the job is still in the queue
+                pass
+        if not finished_job_ids:
+            return changed
+        job_ids = finished_job_ids
+
+        sacct_command = [
+            SACCT_BIN, '--noheader', '-X', '--parsable2',
+            '-j', ','.join(job_ids),
+            '-o', 'JobID,State,ExitCode']
+        output = run_slurm_command(sacct_command)
+
+        for line in output.splitlines():
+            if not line:
+                continue
+            try:
+                job_id, state, exit_code = line.split('|')
+                status = convert_job_status(state)
+            except (KeyError, ValueError):
+                # skip just this job, so that the others still get resolved
+                LOGGER.error('Unexpected sacct output for job: %s', line)
+                continue
+            if status not in FINISHED_STATUSES:
+                continue
+            with self._lock:
+                job = self._jobs.pop(job_id, None)
+            if job is None:
+                continue
+            self._states.pop(job_id, None)
+            changed = True
+            # exit code is returned in the format <exit code>:<signal number>
+            job.set_result((status, int(exit_code.partition(':')[0])))
+        return changed
+
+    def _get_controller_states(self, job_ids):
+        """Get the state of the given jobs from slurmctld in one query.
+
+        squeue only reports jobs that are still in the queue, so jobs that
+        have finished, or that slurmctld has already purged, are missing
+        from the result.
+
+        Args:
+            job_ids: list of ids of the slurm jobs to query
+
+        Returns:
+            dict mapping job id to slurm job state string
+        """
+        squeue_command = [
+            SQUEUE_BIN, '--noheader', '-j', ','.join(job_ids), '-o', '%i|%T']
+        if SQUEUE_ONLY_JOB_STATE:
+            squeue_command.append('--only-job-state')
+        try:
+            output = run_slurm_command(squeue_command)
+        except subprocess.CalledProcessError:
+            # squeue fails when none of the job ids are known to slurmctld
+            return {}
+        states = {}
+        for line in output.splitlines():
+            if line:
+                job_id, state = line.split('|')
+                states[job_id] = state
+        return states
+
+
+POLLER = SlurmStatusPoller()
 
 
 class SlurmManager(BaseManager):
@@ -174,6 +655,43 @@ class SlurmManager(BaseManager):
         """
         super().__init__(manager_def)
         self.is_async = True
+        self.workspace_root = Path(
+            manager_def.get('workspace_root', WORKSPACE_ROOT)).resolve()
+        self.workspace_root.mkdir(parents=True, exist_ok=True)
+        # persistent pool of threads that finalize finished async jobs.
+        # reusing threads avoids spawning one per request, and the cap
+        # bounds how many jobs are finalized (uploaded) concurrently.
+        self._executor = ThreadPoolExecutor(
+            max_workers=manager_def.get('max_workers', 32),
+            thread_name_prefix='slurm-job')
+        # reuse the results of identical executions for this many seconds.
+        # disabled by default, because the data behind a datastack URL may
+        # change without the URL changing.
+        self.result_cache_ttl = manager_def.get('result_cache_ttl', 0)
+        self._result_cache = {}  # maps input hash to (job id, expiry time)
+        self._result_cache_lock = threading.Lock()
+        # limits how many sbatch calls may be in flight at once
+        self._submission_slots = threading.BoundedSemaphore(
+            manager_def.get('max_concurrent_submissions', 4))
+        # upload workspaces with more files than this as a single archive.
+        # disabled by default, because users then have to extract it.
+        self.upload_bundle_threshold = manager_def.get('upload_bundle_threshold')
+        # maps process id to a tuple of (processor, whether it supports async)
+        self._processors = {}
+        # maps job id to (get_job result, job metadata, expiry time)
+        self._job_cache = {}
+        # maps job id to (get_job result, job metadata) for jobs that are
+        # finished and post-processed, which can no longer change
+        self._completed_jobs = {}
+        # guards _job_cache and _completed_jobs, which are shared by request
+        # threads and the threads finalizing jobs
+        self._job_cache_lock = threading.Lock()
+        # the poller is shared by the whole server process, so its bounds
+        # are set from the manager's options
+        POLLER.interval_min = manager_def.get(
+            'poll_interval_min', POLL_INTERVAL_MIN)
+        POLLER.interval_max = manager_def.get(
+            'poll_interval_max', POLL_INTERVAL_MAX)
 
     def get_jobs(self,
                  status: JobStatus = None,
@@ -193,30 +711,27 @@ class SlurmManager(BaseManager):
         """
         # must override the default start time limit to get all jobs
         # for some reason, 1970 doesn't work, but 1971 does
+        # the comment is requested in the same call, so that the metadata of
+        # finished jobs doesn't take another sacct call per job. it goes
+        # last, because it may itself contain the delimiter.
         sacct_command = [
-            'sacct', '-X', '--noheader',
+            SACCT_BIN, '-X', '--noheader', '--parsable2',
             '--starttime', '1971-01-01',
-            '--format', 'JobID,State,Submit,Start,End']
-        LOGGER.debug('Calling sacct: ' + ' '.join(sacct_command))
-        output_lines = subprocess.run(
-            sacct_command, capture_output=True, text=True, check=True
-        ).stdout.strip().split('\n')
-        LOGGER.debug(f'stdout from sacct command: {output_lines}')
+            '--format', 'JobID,State,Submit,Start,End,Comment']
+        output_lines = run_slurm_command(sacct_command).strip().split('\n')
 
         jobs = []
         for line in output_lines:
             if line == '':
                 continue
-            job_id, job_status, submit_time, start_time, end_time = line.split()
+            (job_id, job_status, submit_time, start_time, end_time,
+             comment_string) = line.split('|', 5)
             if status and job_status != status:
                 continue
-            # append Z (UTC) because pygeoapi requires the timezone.
-            # slurm uses the system timezone, which should be UTC.
-            submit_time = f'{submit_time}Z'
-            start_time = '' if start_time == 'Unknown' else f'{start_time}Z'
-            end_time = '' if end_time == 'Unknown' else f'{end_time}Z'
-
-            job_metadata = self.get_job_metadata(job_id)
+            submit_time = format_sacct_time(submit_time)
+            start_time = format_sacct_time(start_time)
+            end_time = format_sacct_time(end_time)
+            job_metadata = self.get_job_metadata(job_id, comment_string)
             jobs.append({
                 "type": "process",
                 "identifier": job_id,
@@ -273,61 +788,72 @@ class SlurmManager(BaseManager):
         :returns: `dict` of job result
         """
         status = self.get_sacct_data(job_id, 'State')
-        LOGGER.debug(f'Status of slurm job {job_id}: {status}')
+        LOGGER.debug('Status of slurm job %s: %s', job_id, status)
         if not status:
             return None
         return convert_job_status(status)
 
-    def get_scontrol_data(self, job_id, field_name):
-        """Get a slurm job data field value using the scontrol command.
+    def get_job_comment(self, job_id):
+        """Get a job's comment from slurmctld using the squeue command.
+
+        squeue prints just the comment, so unlike `scontrol --json` the
+        whole job record doesn't have to be serialized and parsed.
 
         Args:
             job_id: id of the job to query
-            field_name: name of the data field to query
 
         Returns:
-            string field value or None
-        """
-        scontrol_command = ['scontrol', '--json', 'show', 'job', str(job_id)]
-        LOGGER.debug('Calling scontrol: ' + ' '.join(scontrol_command))
-        result = json.loads(subprocess.run(
-            scontrol_command, capture_output=True, text=True, check=True
-        ).stdout.strip())
-        if len(result['jobs']) == 0:
+            string comment, or None if slurmctld doesn't know the job
+        """
+        squeue_command = [
+            SQUEUE_BIN, '--noheader', '--states=all', '-j', str(job_id),
+            '-o', '%k']
+        try:
+            comment_string = run_slurm_command(squeue_command).strip()
+        except subprocess.CalledProcessError:
+            # squeue fails if the job id is not known to slurmctld
             return None
-        return result['jobs'][0][field_name]
+        return comment_string or None
+
+    def get_sacct_data(self, job_id, *field_names):
+        """Get slurm job data field values using the sacct command.
 
-    def get_sacct_data(self, job_id, field_name):
-        """Get a slurm job data field value using the sacct command.
+        All of the fields are fetched in a single sacct call.
 
         Args:
             job_id: id of the job to query
-            field_name: name of the data field to query
+            field_names: names of the data fields to query
 
         Returns:
-            string field value
+            string field value if one field name is given, otherwise a list of
+            string field values in the same order as the field names. Values
+            are empty strings if sacct has no record of the job.
         """
         sacct_command = [
-            'sacct', '--noheader', '-X',
+            SACCT_BIN, '--noheader', '-X', '--parsable2',
             '-j', job_id,
-            '-o', field_name]
-        LOGGER.debug('Calling sacct: ' + ' '.join(sacct_command))
-        result = subprocess.run(
-            sacct_command, capture_output=True, text=True, check=True
-        ).stdout.strip()
-        LOGGER.debug(f'stdout from sacct command: {result}')
-        return result
-
-    def get_job_metadata(self, job_id):
+            '-o', ','.join(field_names)]
+        output = run_slurm_command(sacct_command).strip()
+        if len(field_names) == 1:
+            return output
+        if not output:
+            return [''] * len(field_names)
+        # the last field may itself contain the delimiter (e.g. a comment)
+        return output.split('|', len(field_names) - 1)
+
+    def get_job_metadata(self, job_id, comment_string=None):
         """
         Get a job's metadata as stored in the slurm job comment.
 
         Unlike other job data, the 'comment' field doesn't seem to be added to
         the database until the job finishes. So we first try `sacct`, which has
-        the data for jobs that have finished, and if that fails we try `scontrol`,
-        which can only return data for jobs that are running.
+        the data for jobs that have finished, and if that fails we try `squeue`,
+        which can only return data for jobs that slurmctld still knows about.
 
         :param job_id: job identifier
+        :param comment_string: the job comment, if already fetched with
+                               sacct. sacct is skipped if this is given,
+                               even if it is empty.
 
         :raises JobNotFoundError: if the job_id does not correspond to a
                                   known job
@@ -335,38 +861,15 @@ class SlurmManager(BaseManager):
         """
         # first try sacct, because if the job is finished and we have modified the
         # metadata with sacctmgr, the modification will only show up in sacct
-        # if sacct doesn't have it, try scontrol
-        #
-        # increase returned field width up to 1000 characters
-        # if comment was modified with sacctmgr, it will have replaced " with `
-        # so convert the quotes back before parsing as json
-        comment_string = self.get_sacct_data(
-            job_id, 'Comment%1000').replace('`', '"')
+        # if sacct doesn't have it, try squeue
+        if comment_string is None:
+            comment_string = self.get_sacct_data(job_id, 'Comment')
         if not comment_string:
-            comment_string = self.get_scontrol_data(job_id, 'comment')
+            comment_string = self.get_job_comment(job_id)
         if not comment_string:
-            LOGGER.error('job comment not found by scontrol or sacct')
-            return {}
-        try:
-            LOGGER.debug(comment_string)
-            return json.loads(comment_string)
-        except json.decoder.JSONDecodeError:
+            LOGGER.error('job comment not found by squeue or sacct')
             return {}
-
-    def get_job_submit_time(self, job_id):
-        return f'{self.get_sacct_data(job_id, 'Submit')}Z'
-
-    def get_job_start_time(self, job_id):
-        start_time = self.get_sacct_data(job_id, 'Start')
-        if start_time == 'Unknown':  # for jobs that have not started yet
-            return ''
-        return f'{start_time}Z'
-
-    def get_job_end_time(self, job_id):
-        end_time = self.get_sacct_data(job_id, 'End')
-        if end_time == 'Unknown':  # for jobs that have not finished yet
-            return ''
-        return f'{end_time}Z'
+        return parse_job_comment(comment_string)
 
     def get_job(self, job_id: str) -> dict:
         """
@@ -378,35 +881,83 @@ class SlurmManager(BaseManager):
                                   known job
         :returns: `dict` of job result
         """
-        job_metadata = self.get_job_metadata(job_id)
-        job_status = self.get_job_status(job_id)
+        return self.get_job_and_metadata(job_id)[0]
+
+    def get_job_and_metadata(self, job_id):
+        """Get a job status, and the job metadata it was derived from.
+
+        Args:
+            job_id: id of the slurm job
+
+        Returns:
+            tuple of the `dict` returned by get_job and the `dict` of job
+            metadata from the job comment
+
+        Raises:
+            JobNotFoundError if the job_id does not correspond to a known job
+        """
+        # clients tend to poll /jobs/<job_id>, so answer repeated requests
+        # from a short-lived cache
+        with self._job_cache_lock:
+            if job_id in self._completed_jobs:
+                return self._completed_jobs[job_id]
+            cached_job = self._job_cache.get(job_id)
+        if cached_job is not None and cached_job[2] > time.monotonic():
+            return cached_job[:2]
+
+        # get everything slurmdbd knows about the job in one call.
+        # the comment goes last, because it may itself contain the delimiter.
+        state, submit_time, start_time, end_time, comment_string = (
+            self.get_sacct_data(
+                job_id, 'State', 'Submit', 'Start', 'End', 'Comment'))
+        if not state:
+            raise JobNotFoundError()
+        job_status = convert_job_status(state)
+        job_metadata = self.get_job_metadata(job_id, comment_string)
 
         # After the job finishes, we need to wait for the workspace to finish
         # uploading to the bucket. After uploading has finished, we update the
         # job metadata to indicate that it's complete.
         # If 'completed' has not been set to True, the job status is still
         # 'running' for the purpose of API clients.
-        if job_status in {JobStatus.failed, JobStatus.dismissed, JobStatus.successful}:
-            if self.get_job_metadata(job_id).get('completed', True):
-                LOGGER.debug(f'Job {job_id} and post processing completed.')
+        job_completed = False
+        if job_status in FINISHED_STATUSES:
+            if job_metadata.get('completed', True):
+                LOGGER.debug('Job %s and post processing completed.', job_id)
+                job_completed = True
             else:
                 LOGGER.debug('Job finished but post processing is not yet complete.')
                 job_status = JobStatus.running
 
-        return {
+        job = {
             "type": "process",
             "identifier": job_id,
             "process_id": job_metadata['process_id'],
             "location": job_metadata.get('workspace_url', '?'),
-            "created": self.get_job_submit_time(job_id),
-            "started": self.get_job_start_time(job_id),
-            "finished": self.get_job_end_time(job_id),
-            "updated": self.get_job_submit_time(job_id),
+            "created": format_sacct_time(submit_time),
+            "started": format_sacct_time(start_time),
+            "finished": format_sacct_time(end_time),
+            "updated": format_sacct_time(submit_time),
             "status": job_status.value,
             "mimetype": "application/json",
             "message": "",
             "progress": -1
         }
+        with self._job_cache_lock:
+            if job_completed:
+                # bound the cache by evicting the oldest entry
+                if len(self._completed_jobs) >= COMPLETED_JOB_CACHE_SIZE:
+                    self._completed_jobs.pop(next(iter(self._completed_jobs)), None)
+                self._completed_jobs[job_id] = (job, job_metadata)
+                self._job_cache.pop(job_id, None)
+                return job, job_metadata
+
+            now = time.monotonic()
+            self._job_cache = {
+                cached_id: cached_job for cached_id, cached_job
+                in self._job_cache.items() if cached_job[2] > now}
+            self._job_cache[job_id] = (job, job_metadata, now + STATUS_CACHE_TTL)
+        return job, job_metadata
 
     def get_job_result(self, job_id: str) -> Tuple[str, Any]:
         """
@@ -439,6 +990,36 @@ class SlurmManager(BaseManager):
         """
         raise NotImplementedError()
 
+    def get_processor(self, process_id):
+        """Get the processor for a process, reusing it after the first lookup.
+
+        The processors are stateless, so there is no need to load the plugin
+        and construct a new one for every request.
+
+        :param process_id: process identifier
+
+        :raises UnknownProcessError: if the input process_id does not
+                                     correspond to a known process
+        :returns: instance of the processor
+        """
+        return self._lookup_processor(process_id)[0]
+
+    def _lookup_processor(self, process_id):
+        """Get a cached processor and whether it supports async execution.
+
+        :param process_id: process identifier
+
+        :returns: tuple of the processor and a `bool` that is True if the
+                  processor supports async execution
+        """
+        if process_id not in self._processors:
+            processor = super().get_processor(process_id)
+            supports_async = (
+                ProcessExecutionMode.async_execute.value in
+                processor.metadata.get('jobControlOptions', []))
+            self._processors[process_id] = (processor, supports_async)
+        return self._processors[process_id]
+
     def execute_process(
             self, process_id, data_dict, execution_mode=None,
             requested_outputs=None, subscriber=None,
@@ -468,14 +1049,20 @@ class SlurmManager(BaseManager):
                   optionally additional HTTP headers to include in the final
                   response
         """
-        processor = self.get_processor(process_id)
+        processor, process_supports_async = self._lookup_processor(process_id)
+
+        result_key = None
+        if self.result_cache_ttl:
+            result_key = hashlib.blake2b(
+                json.dumps([process_id, data_dict], sort_keys=True).encode(),
+                digest_size=16).hexdigest()
+            cached_result = self.get_cached_result(
+                processor, result_key, requested_response)
+            if cached_result is not None:
+                return cached_result
+
         if execution_mode == RequestedProcessExecutionMode.respond_async:
-            job_control_options = processor.metadata.get(
-                'jobControlOptions', [])
             # client wants async - do we support it?
-            process_supports_async = (
-                ProcessExecutionMode.async_execute.value in job_control_options
-                )
             if self.is_async and process_supports_async:
                 LOGGER.debug('Asynchronous execution')
                 handler = self._execute_handler_async
@@ -508,41 +1095,90 @@ class SlurmManager(BaseManager):
             requested_outputs,
             requested_response=requested_response)
 
+        if result_key is not None and status != JobStatus.failed:
+            now = time.monotonic()
+            with self._result_cache_lock:
+                # drop expired entries, so the cache doesn't grow with every
+                # distinct request
+                self._result_cache = {
+                    cached_key: cached_result for cached_key, cached_result
+                    in self._result_cache.items() if cached_result[1] > now}
+                self._result_cache[result_key] = (
+                    job_id, now + self.result_cache_ttl)
+
         return job_id, mime_type, outputs, status, response_headers
 
-    def monitor_job_status(self, job_id, workspace_dir, get_outputs_func):
-        """Poll the slurm job until it completes, then perform final processing.
+    def get_cached_result(self, processor, result_key, requested_response):
+        """Look up a recent, successful execution with identical inputs.
+
+        Args:
+            processor: `pygeoapi.process` object
+            result_key (str): hash of the process id and its inputs
+            requested_response: `RequestedResponse` optionally specifying
+                raw or document
+
+        Returns:
+            tuple of job id, MIME type, response payload, status and
+            additional HTTP headers of the cached execution, or None if there
+            is no usable cached result
+        """
+        with self._result_cache_lock:
+            job_id, expires = self._result_cache.get(result_key, (None, 0))
+        if time.monotonic() > expires:
+            return None
+        # if the results can't be looked up for any reason (e.g. the job or
+        # its local workspace is gone), just run the process again
+        try:
+            job, job_metadata = self.get_job_and_metadata(job_id)
+            # the job may still be running, or may have failed
+            if job['status'] != JobStatus.successful.value:
+                return None
+            outputs = processor.get_outputs(job_metadata['workspace_dir'])
+            _, default_outputs = self.get_job_result(job_id)
+            outputs.update(default_outputs)
+        except Exception as err:
+            LOGGER.warning('Could not reuse the results of job %s: %r', job_id, err)
+            return None
+
+        LOGGER.debug('Reusing the results of job %s', job_id)
+        if requested_response == RequestedResponse.document.value:
+            outputs = {
+                'outputs': [outputs]
+            }
+        return job_id, 'application/json', outputs, JobStatus.successful, {
+            'Preference-Applied': RequestedProcessExecutionMode.wait.value}
+
+    def finalize_job(self, job_id, workspace_dir, get_outputs_func, job_done):
+        """Perform final processing once a slurm job has finished.
+
+        Collects the job outputs, uploads the workspace to the bucket, and
+        marks the job metadata as completed.
 
         Args:
             job_id: id of the slurm job
             workspace_dir: slurm job's workspace directory
             get_outputs_func: the Process's output processing method that will
                 be run after the job completes
+            job_done (Future): Future that resolves to the job's final
+                (JobStatus, exit code), such as the one from POLLER.register.
+                Blocks until it resolves, if it has not already.
 
         Returns:
             dict of job outputs
         """
         try:
-            # wait for the slurm job to complete
-            while True:
-                # check the 'state' string from the job data in sacct
-                status = self.get_job_status(job_id)
-                LOGGER.debug(f'Status of slurm job {job_id}: {status}')
-                if status in {JobStatus.successful, JobStatus.failed, JobStatus.dismissed}:
-                    break
-                time.sleep(5)
-
-            # get the exit code from the job data in sacct
-            # is returned in the format <exit code>:<signal number>
-            exit_code = int(self.get_sacct_data(job_id, 'ExitCode').split(':')[0])
-            LOGGER.debug(f'Exit code of slurm job {job_id}: {exit_code}')
+            status, exit_code = job_done.result()
+            LOGGER.debug('Status of slurm job %s: %s', job_id, status)
+            LOGGER.debug('Exit code of slurm job %s: %s', job_id, exit_code)
             if exit_code != 0:
-                LOGGER.error(f'Job {job_id} finished with non-zero exit code: {exit_code}')
+                LOGGER.error('Job %s finished with non-zero exit code: %s', job_id, exit_code)
 
         except Exception as err:
             LOGGER.exception(err)
 
         finally:
+            # returned as is if the outputs can't be collected
+            outputs = {}
             try:
                 # get a dict of outputs (if any) from the workspace
                 # for the validate process, this includes the validation messages
@@ -555,19 +1191,23 @@ class SlurmManager(BaseManager):
 
                 # Upload the workspace even if something went wrong, so that the
                 # user can access the slurm related files and any partial results.
-                LOGGER.debug(f'Copying workspace for job {job_id} to bucket')
-                upload_directory_to_bucket(workspace_dir)
+                LOGGER.debug('Copying workspace for job %s to bucket', job_id)
+                upload_directory_to_bucket(
+                    workspace_dir, self.upload_bundle_threshold)
 
             except Exception as err:
                 LOGGER.exception(err)
 
             finally:
-                LOGGER.debug(f'Updating metadata for job {job_id} to indicate job is complete')
+                LOGGER.debug('Updating metadata for job %s to indicate job is complete', job_id)
                 job_metadata = self.get_job_metadata(job_id)
                 job_metadata['completed'] = True
-                subprocess.run([
-                    'sacctmgr', 'modify', '--immediate', 'job', f'jobid={job_id}',
-                    'set', f"comment='{json.dumps(job_metadata)}'"], check=True)
+                run_slurm_command([
+                    SACCTMGR_BIN, 'modify', '--immediate', 'job', f'jobid={job_id}',
+                    'set', f"comment='{json.dumps(job_metadata, separators=(',', ':'))}'"])
+                # don't keep reporting the job as running from the cache
+                with self._job_cache_lock:
+                    self._job_cache.pop(job_id, None)
                 return outputs
 
     def _execute_handler_sync(self, processor, data_dict, requested_outputs=None,
@@ -594,7 +1234,9 @@ class SlurmManager(BaseManager):
             tuple of job id, MIME type, response payload, and status
         """
         try:
-            job_id, workspace_dir = self.submit_slurm_job(processor, data_dict)
+            # blocks until the job has finished
+            job_id, workspace_dir = self.submit_slurm_job(
+                processor, data_dict, wait=True)
         except Exception as ex:
             LOGGER.error(
                 'Something went wrong while trying to submit the slurm job. '
@@ -602,16 +1244,18 @@ class SlurmManager(BaseManager):
                 'return to the user.')
             raise ex
 
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(
-                self.monitor_job_status, job_id, workspace_dir, processor.get_outputs)
-            outputs = future.result()  # Blocks until thread is done
+        # slurmdbd may not have recorded the end of the job yet, and the
+        # comment must not be marked completed before it has. the poller
+        # resolves the job once sacct reports it finished.
+        job_done = POLLER.register(job_id)
+        outputs = self.finalize_job(
+            job_id, workspace_dir, processor.get_outputs, job_done)
 
         if requested_response == RequestedResponse.document.value:
             outputs = {
                 'outputs': [outputs]
             }
-        final_status = self.get_job_status(job_id)
+        final_status, _ = job_done.result()
         return job_id, 'application/json', outputs, final_status
 
     def _execute_handler_async(self, processor, data_dict, requested_outputs=None,
@@ -642,11 +1286,14 @@ class SlurmManager(BaseManager):
                 'return to the user.')
             raise ex
 
-        # Monitor job in a separate thread, don't wait for it to complete
-        monitor_thread = threading.Thread(
-            target=self.monitor_job_status,
-            args=(job_id, workspace_dir, processor.get_outputs))
-        monitor_thread.start()
+        # Don't wait for the job to complete. Once the poller sees it finish,
+        # finalize it on a pool thread, so that no thread is tied up while
+        # the job is queued or running.
+        POLLER.register(job_id).add_done_callback(
+            lambda job_done: self._executor.submit(
+                self.finalize_job, job_id, workspace_dir,
+                processor.get_outputs, job_done
+            ).add_done_callback(log_future_exception))
 
         outputs = {
             'job_id': job_id,
@@ -658,9 +1305,10 @@ class SlurmManager(BaseManager):
                 'outputs': [outputs]
             }
 
-        # wait for the job to be recorded by slurm
+        # wait for the job to be recorded by slurmdbd, which get_job relies
+        # on. slurmctld (and so the poller) may know about it sooner.
         for i in range(60):
-            if self.get_job_status(job_id) is not None:
+            if self.get_sacct_data(job_id, 'State'):
                 break
             time.sleep(1)
         else:
@@ -669,12 +1317,15 @@ class SlurmManager(BaseManager):
 
         return job_id, 'application/json', outputs, JobStatus.accepted
 
-    def submit_slurm_job(self, processor, data_dict):
+    def submit_slurm_job(self, processor, data_dict, wait=False):
         """Submit a slurm job to execute the process.
 
         Args:
             processor (Processor): processor to be executed
             data_dict (dict): user data to pass to the processor
+            wait (bool): if True, submit with `sbatch --wait` and don't
+                return until slurmctld reports the job has finished.
+                slurmdbd may not have recorded the end of the job yet.
 
         Returns:
             job_id, workspace_dir
@@ -686,45 +1337,63 @@ class SlurmManager(BaseManager):
         # access after the job finishes.
         # NOTE: this cannot live in the system default tmp directory, for some
         # reason the contents got deleted immediately.
-        workspace_dir = tempfile.mkdtemp(prefix='slurm_wksp_', dir=WORKSPACE_ROOT)
+        workspace_dir = tempfile.mkdtemp(
+            prefix='slurm_wksp_', dir=self.workspace_root)
 
-        # create the slurm script in the workspace so that the user can see it
-        script_path = Path(workspace_dir) / 'script.slurm'
+        # save the slurm script in the workspace so that the user can see it.
+        # sbatch is given the script on stdin, so it doesn't have to read the
+        # file back from shared storage.
         script = processor.create_slurm_script(**data_dict, workspace_dir=workspace_dir)
-        with open(script_path, 'w') as fp:
-            fp.write(script)
+        (Path(workspace_dir) / 'script.slurm').write_text(script)
 
-        LOGGER.debug('Content of slurm script to be submitted:\n')
-        with open(script_path) as fp:
-            LOGGER.debug(fp.read())
+        LOGGER.debug('Content of slurm script to be submitted:\n%s', script)
 
+        # compact separators keep the --comment argument short
         job_metadata = json.dumps({
             'workspace_dir': workspace_dir,
-            'workspace_url': f'gs://{BUCKET_NAME}/{Path(workspace_dir).name}',
+            'workspace_url': f'gs://{BUCKET_NAME}/{os.path.basename(workspace_dir)}',
             'process_id': processor.metadata['id'],
             'completed': False
-        })
+        }, separators=(',', ':'))
 
         # Submit the job
         try:
             args = [
-                'sbatch', '--parsable',
+                SBATCH_BIN, '--parsable',
                 '--comment', f'{job_metadata}',  # custom metadata
+                # otherwise named 'sbatch', since the script comes from stdin
+                '--job-name', processor.metadata['id'],
                 '--chdir', workspace_dir,
                 '--output', 'stdout.log',  # relative to the slurm workspace dir
-                '--error', 'stderr.log',
-                script_path]
+                '--error', 'stderr.log']
+            if wait:
+                args.insert(2, '--wait')
             LOGGER.info(
-                f'Submitting slurm job with the following command:\n{args}')
-            result = subprocess.run(
-                args, capture_output=True, text=True, check=True)
-            LOGGER.info(f'stdout from sbatch: {result.stdout}')
+                'Submitting slurm job with the following command:\n%s', args)
+            if wait:
+                # sbatch exits with the job's exit code, so a non-zero exit
+                # only means the submission failed if no job id was printed.
+                # the job's final state is then looked up by the caller.
+                # it isn't given a submission slot, since it holds on to it
+                # for the whole run of the job.
+                try:
+                    stdout = run_slurm_command(args, input_text=script)
+                except subprocess.CalledProcessError as e:
+                    if not e.stdout.strip():
+                        raise
+                    stdout = e.stdout
+            else:
+                # under a burst of requests, queue here rather than hitting
+                # slurmctld with many simultaneous submissions
+                with self._submission_slots:
+                    stdout = run_slurm_command(args, input_text=script)
+            LOGGER.info('stdout from sbatch: %s', stdout)
 
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f'Error when submitting slurm job: {e.stderr}') from e
 
-        job_id = result.stdout.strip()
-        LOGGER.info(f"Job submitted successfully with ID: {job_id}")
+        job_id = stdout.strip()
+        LOGGER.info("Job submitted successfully with ID: %s", job_id)
         return job_id, workspace_dir
 
     def __repr__(self):
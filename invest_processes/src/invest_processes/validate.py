@@ -2,9 +2,8 @@ import json
 import logging
 from pathlib import Path
 import textwrap
-import time
 
-from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
+from pygeoapi.process.base import BaseProcessor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -64,6 +63,17 @@ PROCESS_METADATA = {
     }
 }
 
+# dedented once at import; filled in per job by create_slurm_script
+SLURM_SCRIPT_TEMPLATE = textwrap.dedent("""\
+    #!/bin/sh
+    #SBATCH --time=10
+
+    mkdir {workspace_dir}/datastack
+    curl "{datastack_url}" | tar -xzvf - -C {workspace_dir}/datastack
+    invest validate --json {json_path} > {workspace_dir}/validation_results.json
+    """)
+
+
 class ValidateProcessor(BaseProcessor):
     """InVEST validate process"""
 
@@ -91,16 +101,10 @@ class ValidateProcessor(BaseProcessor):
             string contents of the script
         """
         json_path = f'{workspace_dir}/datastack/parameters.invest.json'
-        return textwrap.dedent(f"""\
-            #!/bin/sh
-            #SBATCH --time=10
-
-            curl -o datastack.tgz "{datastack_url}"
-            mkdir {workspace_dir}/datastack
-            tar -xzvf datastack.tgz -C {workspace_dir}/datastack
-            rm datastack.tgz
-            invest validate --json {json_path} > {workspace_dir}/validation_results.json
-            """)
+        return SLURM_SCRIPT_TEMPLATE.format(
+            datastack_url=datastack_url,
+            workspace_dir=workspace_dir,
+            json_path=json_path)
 
     def get_outputs(self, workspace_dir):
         """Return outputs given a workspace from completed slurm job.
@@ -113,7 +117,7 @@ class ValidateProcessor(BaseProcessor):
         """
         output_filepath = Path(workspace_dir) / 'validation_results.json'
         with open(output_filepath) as file:
-            json_output = json.loads(file.read())
+            json_output = json.load(file)
         # convert the list of lists to a list of maps
         return {'validation_results': [{
             'input_ids': input_ids,
@@ -0,0 +1,241 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from pygeoapi.util import JobStatus
+
+from invest_processes import slurm_manager
+
+
+def fake_slurm(squeue_output='', sacct_output=''):
+    """Make a stand-in for run_slurm_command with canned output.
+
+    Args:
+        squeue_output (str): stdout to return for squeue commands
+        sacct_output (str): stdout to return for sacct commands
+
+    Returns:
+        function that can replace slurm_manager.run_slurm_command
+    """
+    def run_slurm_command(command, input_text=None):
+        if os.path.basename(command[0]) == 'squeue':
+            return squeue_output
+        return sacct_output
+    return run_slurm_command
+
+
+class SlurmStatusPollerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.poller = slurm_manager.SlurmStatusPoller()
+
+    def poll(self, job_ids, **output):
+        """Poll once for the given jobs, without starting the poll thread."""
+        with mock.patch.object(
+                slurm_manager, 'run_slurm_command', fake_slurm(**output)):
+            return self.poller._poll(job_ids)
+
+    def testFinishedJob(self):
+        """A job that sacct reports as finished is resolved."""
+        with mock.patch.object(self.poller, '_poll_loop'):
+            job = self.poller.register('100')
+        self.assertTrue(self.poll(['100'], sacct_output='100|FAILED|2:0\n'))
+        self.assertEqual(job.result(timeout=0), (JobStatus.failed, 2))
+
+    def testRunningJob(self):
+        """A job that is still in the queue is left outstanding."""
+        with mock.patch.object(self.poller, '_poll_loop'):
+            job = self.poller.register('100')
+        self.assertTrue(self.poll(['100'], squeue_output='100|RUNNING\n'))
+        self.assertFalse(job.done())
+        # nothing changed since the last poll
+        self.assertFalse(self.poll(['100'], squeue_output='100|RUNNING\n'))
+
+    def testQueuedJobsSkipSacct(self):
+        """Only jobs that have left the queue or finished go to sacct."""
+        run_slurm_command = mock.Mock(side_effect=fake_slurm(
+            squeue_output='100|CONFIGURING\n101|COMPLETING\n102|FAILED\n',
+            sacct_output='102|FAILED|1:0\n103|COMPLETED|0:0\n'))
+        with mock.patch.object(
+                slurm_manager, 'run_slurm_command', run_slurm_command):
+            self.poller._poll(['100', '101', '102', '103'])
+        sacct_command = run_slurm_command.call_args_list[-1][0][0]
+        self.assertEqual(
+            sacct_command[sacct_command.index('-j') + 1], '102,103')
+
+    def testUnmappedState(self):
+        """A job in an unknown state doesn't stop other jobs resolving."""
+        with mock.patch.object(self.poller, '_poll_loop'):
+            job_a = self.poller.register('100')
+            job_b = self.poller.register('101')
+        self.poll(
+            ['100', '101'],
+            sacct_output='100|REQUEUED|0:0\n101|COMPLETED|0:0\n')
+        self.assertFalse(job_a.done())
+        self.assertEqual(job_b.result(timeout=0), (JobStatus.successful, 0))
+
+
+class SlurmOutputParsingTests(unittest.TestCase):
+
+    def testFormatSacctTime(self):
+        """Times are marked as UTC, and unknown times are empty."""
+        self.assertEqual(
+            slurm_manager.format_sacct_time('2025-01-01T00:00:00'),
+            '2025-01-01T00:00:00Z')
+        self.assertEqual(slurm_manager.format_sacct_time('Unknown'), '')
+
+    def testParseJobComment(self):
+        """Comments are parsed, including those modified by sacctmgr."""
+        self.assertEqual(
+            slurm_manager.parse_job_comment('{"completed":false}'),
+            {'completed': False})
+        self.assertEqual(
+            slurm_manager.parse_job_comment('{`completed`:true}'),
+            {'completed': True})
+        self.assertEqual(slurm_manager.parse_job_comment('not json'), {})
+
+    def testGetSacctData(self):
+        """Fields are split, leaving delimiters in the last field."""
+        manager = mock.Mock(spec=slurm_manager.SlurmManager)
+        with mock.patch.object(
+                slurm_manager, 'run_slurm_command',
+                fake_slurm(sacct_output='COMPLETED|{"a":"b|c"}\n')):
+            self.assertEqual(
+                slurm_manager.SlurmManager.get_sacct_data(
+                    manager, '100', 'State', 'Comment'),
+                ['COMPLETED', '{"a":"b|c"}'])
+        with mock.patch.object(
+                slurm_manager, 'run_slurm_command', fake_slurm()):
+            self.assertEqual(
+                slurm_manager.SlurmManager.get_sacct_data(
+                    manager, '100', 'State', 'Comment'),
+                ['', ''])
+
+
+class IterFilesTests(unittest.TestCase):
+
+    def setUp(self):
+        self.workspace_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace_dir)
+
+    def testIterFiles(self):
+        """All files are found, including those in nested directories."""
+        expected_paths = set()
+        for relative_path in ['a.txt', 'sub/b.log', 'sub/deeper/c.tif']:
+            path = os.path.join(self.workspace_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as file:
+                file.write('x')
+            expected_paths.add(path)
+        os.mkdir(os.path.join(self.workspace_dir, 'empty'))
+        self.assertEqual(
+            set(slurm_manager.iter_files(self.workspace_dir)), expected_paths)
+
+
+class UploadDirectoryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.parent_dir = tempfile.mkdtemp()
+        self.workspace_dir = os.path.join(self.parent_dir, 'wk')
+        for relative_path, size in [
+                ('a.txt', 1), ('sub/b.tif', 1), ('sub/big.tif', 100)]:
+            path = os.path.join(self.workspace_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as file:
+                file.write(b'x' * size)
+
+    def tearDown(self):
+        shutil.rmtree(self.parent_dir)
+
+    def upload(self, dir_path):
+        """Upload a directory with the bucket and transfer_manager mocked.
+
+        Returns:
+            dict mapping how files were uploaded (small, text, or large) to
+            a list of their blob names
+        """
+        small_filenames = []
+
+        def upload_many_from_filenames(bucket, filenames, **kwargs):
+            # copied, since the caller goes on to extend the list
+            small_filenames.extend(filenames)
+            return [None] * len(filenames)
+
+        transfer_manager = mock.Mock()
+        transfer_manager.upload_many_from_filenames.side_effect = (
+            upload_many_from_filenames)
+        with mock.patch.object(slurm_manager, 'transfer_manager', transfer_manager), \
+                mock.patch.object(slurm_manager, 'upload_gzipped_file') as upload_gzipped_file, \
+                mock.patch.object(slurm_manager, 'get_bucket') as get_bucket, \
+                mock.patch.object(slurm_manager, 'GZIP_TEXT_UPLOADS', True), \
+                mock.patch.object(slurm_manager, 'LARGE_FILE_BYTES', 10):
+            slurm_manager.upload_directory_to_bucket(dir_path)
+
+        # large files are the only ones given a blob directly
+        return {
+            'small': small_filenames,
+            'text': [
+                call[0][2] for call in upload_gzipped_file.call_args_list],
+            'large': [
+                call[0][0] for call in get_bucket.return_value.blob.call_args_list]
+        }
+
+    def assertUploads(self, uploads):
+        """Assert that each file was uploaded the right way, by blob name."""
+        self.assertEqual(uploads, {
+            'small': ['wk/sub/b.tif'],
+            'text': ['wk/a.txt'],
+            'large': ['wk/sub/big.tif']
+        })
+
+    def testAbsolutePath(self):
+        """Files are split by type and size, and named under the workspace."""
+        self.assertUploads(self.upload(self.workspace_dir))
+
+    def testRelativePath(self):
+        """Blob names keep the workspace name for a relative path."""
+        cwd = os.getcwd()
+        os.chdir(self.parent_dir)
+        self.addCleanup(os.chdir, cwd)
+        self.assertUploads(self.upload('wk'))
+
+
+class SubmitSlurmJobTests(unittest.TestCase):
+
+    def setUp(self):
+        self.workspace_root = tempfile.mkdtemp()
+        self.manager = mock.Mock(spec=slurm_manager.SlurmManager)
+        self.manager.workspace_root = self.workspace_root
+        self.manager._submission_slots = threading.BoundedSemaphore(1)
+        self.processor = mock.Mock()
+        self.processor.metadata = {'id': 'invest-execute'}
+        self.processor.create_slurm_script.return_value = '#!/bin/sh\n'
+
+    def tearDown(self):
+        shutil.rmtree(self.workspace_root)
+
+    def submit(self, error):
+        """Submit a job with --wait, with sbatch failing with the given error."""
+        with mock.patch.object(
+                slurm_manager, 'run_slurm_command', side_effect=error):
+            return slurm_manager.SlurmManager.submit_slurm_job(
+                self.manager, self.processor, {}, wait=True)
+
+    def testWaitJobFailed(self):
+        """A non-zero exit from sbatch --wait with a job id is not an error."""
+        job_id, workspace_dir = self.submit(subprocess.CalledProcessError(
+            1, ['sbatch'], output='123\n', stderr=''))
+        self.assertEqual(job_id, '123')
+        self.assertTrue(workspace_dir.startswith(self.workspace_root))
+
+    def testWaitSubmissionFailed(self):
+        """A non-zero exit from sbatch --wait without a job id is an error."""
+        with self.assertRaises(RuntimeError):
+            self.submit(subprocess.CalledProcessError(
+                1, ['sbatch'], output='', stderr='invalid partition'))